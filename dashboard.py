@@ -9,6 +9,7 @@ Author: Enderson Menezes
 Created: 2025-06-24
 """
 
+import hashlib
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -16,7 +17,10 @@ from plotly.subplots import make_subplots
 import streamlit as st
 from pathlib import Path
 from datetime import datetime
+from itertools import repeat
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # =====================================================================
 # PAGE CONFIGURATION
@@ -33,112 +37,241 @@ st.set_page_config(
 # DATA LOADING
 # =====================================================================
 
+# Columns read by the dashboard; anything else in the file is never decoded
+DATA_COLUMNS = [
+    'date', 'organization', 'download_timestamp',
+    'total_active_users', 'total_engaged_users',
+    'copilot_ide_code_completions', 'copilot_ide_chat',
+    'copilot_dotcom_chat', 'copilot_dotcom_pull_requests'
+]
+
+def read_parquet_columns(source):
+    """Read only the dashboard columns from a Parquet file path or file-like object."""
+    # Paths are memory-mapped so column chunks are decoded straight from the page cache
+    parquet_file = pq.ParquetFile(source, memory_map=True)
+    columns = [c for c in parquet_file.schema_arrow.names if c in DATA_COLUMNS]
+    table = parquet_file.read(columns=columns, use_threads=True)
+    # Release Arrow buffers as pandas takes ownership to keep peak memory down
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    # Daily user counts fit in int32, halving what every filter and reduction reads
+    counts = [
+        c for c in ('total_active_users', 'total_engaged_users')
+        if c in df.columns and pd.api.types.is_integer_dtype(df[c])
+    ]
+    df = df.astype({c: np.int32 for c in counts})
+    # Date filters slice by binary search, which needs rows in date order
+    if 'date' in df.columns and not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable', ignore_index=True)
+    return df
+
 @st.cache_data
 def load_data_from_file(uploaded_file):
     """Load and cache the processed Copilot data from uploaded file."""
     try:
-        df = pd.read_parquet(uploaded_file)
+        # Read the uploaded bytes through Arrow's native buffer reader rather than
+        # the Python file object, so column chunks are sliced without copies
+        df = read_parquet_columns(pa.BufferReader(uploaded_file.getvalue()))
         return df
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return None
 
+LOCAL_DATA_FILE = Path("data.parquet")
+
 @st.cache_data
 def load_data_local():
     """Load data from local file (for development)."""
-    parquet_file = Path("data.parquet")
+    parquet_file = LOCAL_DATA_FILE
     
     if parquet_file.exists():
-        df = pd.read_parquet(parquet_file)
+        df = read_parquet_columns(parquet_file)
         return df
     else:
         return None
 
-def extract_language_metrics(df):
-    """Extract language-specific metrics from the nested data structure."""
-    language_data = []
-    
-    for _, row in df.iterrows():
-        date = row['date']
-        org = row['organization']
-        
-        # Extract code completions data
-        if 'copilot_ide_code_completions' in row and row['copilot_ide_code_completions']:
-            completions = row['copilot_ide_code_completions']
-            
-            # Check if it has editors
-            if 'editors' in completions:
-                for editor in completions['editors']:
-                    editor_name = editor.get('name', 'unknown')
-                    
-                    if 'models' in editor:
-                        for model in editor['models']:
-                            if 'languages' in model:
-                                for lang in model['languages']:
-                                    language_data.append({
-                                        'date': date,
-                                        'organization': org,
-                                        'editor': editor_name,
-                                        'language': lang.get('name', 'unknown'),
-                                        'total_engaged_users': lang.get('total_engaged_users', 0),
-                                        'total_code_acceptances': lang.get('total_code_acceptances', 0),
-                                        'total_code_suggestions': lang.get('total_code_suggestions', 0),
-                                        'total_code_lines_accepted': lang.get('total_code_lines_accepted', 0),
-                                        'total_code_lines_suggested': lang.get('total_code_lines_suggested', 0),
-                                        'feature_type': 'code_completions'
-                                    })
-    
-    return pd.DataFrame(language_data)
+# Leaf record types pulled out of the nested API payload
+LANGUAGE_RECORD = pa.struct([
+    ('name', pa.string()),
+    ('total_engaged_users', pa.int32()),
+    ('total_code_acceptances', pa.int32()),
+    ('total_code_suggestions', pa.int32()),
+    ('total_code_lines_accepted', pa.int32()),
+    ('total_code_lines_suggested', pa.int32())
+])
+CHAT_MODEL_RECORD = pa.struct([
+    ('total_engaged_users', pa.int32()),
+    ('total_chats', pa.int32()),
+    ('total_chat_copy_events', pa.int32()),
+    ('total_chat_insertion_events', pa.int32())
+])
+DOTCOM_MODEL_RECORD = pa.struct([
+    ('name', pa.string()),
+    ('is_custom_model', pa.bool_()),
+    ('total_chats', pa.int32()),
+    ('total_engaged_users', pa.int32())
+])
+LANGUAGE_FIELDS = [field.name for field in LANGUAGE_RECORD]
+CHAT_MODEL_FIELDS = [field.name for field in CHAT_MODEL_RECORD]
 
-def extract_chat_metrics(df):
-    """Extract chat-specific metrics from the nested data structure."""
-    chat_data = []
-    
-    for _, row in df.iterrows():
-        date = row['date']
-        org = row['organization']
+def records_frame(records, record_type):
+    """Convert leaf record dicts to typed columns."""
+    # Arrow builds the columns from the record type without dtype inference;
+    # missing keys become nulls and keys outside the type are ignored
+    columns = pa.array(records, type=record_type).flatten()
+    return pa.Table.from_arrays(columns, names=[field.name for field in record_type]).to_pandas()
+
+def repeat_keys(keys, counts, columns=('date', 'organization', 'editor')):
+    """Build the key frame, repeating each key once per leaf record."""
+    key_df = pd.DataFrame.from_records(keys, columns=list(columns))
+    positions = np.repeat(np.arange(len(key_df)), np.asarray(counts, dtype=np.intp))
+    return key_df.take(positions).reset_index(drop=True)
+
+@st.cache_data(show_spinner=False)
+def extract_all_metrics(_df, source_key):
+    """Extract language, chat and GitHub.com metrics from nested data."""
+    # The frame is not hashed by Streamlit (leading underscore); source_key
+    # identifies the loaded data so the walk runs once per data source
+    # Only rows carrying at least one nested payload need to be walked
+    nested = [
+        'copilot_ide_code_completions', 'copilot_ide_chat',
+        'copilot_dotcom_chat', 'copilot_dotcom_pull_requests'
+    ]
+    present = [c for c in nested if c in _df.columns]
+    df = _df.loc[_df[present].notna().any(axis=1)]
+    
+    # The loop only collects the leaf dicts plus one (date, org, editor) key and
+    # record count per model; the columns are built from them in one go
+    language_keys = []
+    language_counts = []
+    language_records = []
+    chat_keys = []
+    chat_counts = []
+    chat_records = []
+    dotcom_chat_rows = []
+    dotcom_keys = []
+    dotcom_counts = []
+    dotcom_records = []
+    pull_request_rows = []
+    
+    # Bind the bound methods used in the hot loop to locals (LOAD_FAST)
+    add_language_records = language_records.extend
+    add_language_key = language_keys.append
+    add_language_count = language_counts.append
+    add_chat_records = chat_records.extend
+    add_chat_key = chat_keys.append
+    add_chat_count = chat_counts.append
+    add_dotcom_chat_row = dotcom_chat_rows.append
+    add_dotcom_records = dotcom_records.extend
+    add_dotcom_key = dotcom_keys.append
+    add_dotcom_count = dotcom_counts.append
+    add_pull_request_row = pull_request_rows.append
+    
+    # Walk the needed columns as plain arrays instead of building a Series per row;
+    # payload columns missing from the file are walked as all-None
+    cols = ['date', 'organization'] + nested
+    arrays = [df[c].to_numpy() if c in df.columns else repeat(None, len(df)) for c in cols]
+    for date, org, completions, chat, dotcom_chat, pull_requests in zip(*arrays):
+        # Extract code completions data
+        editors = completions.get('editors') if completions else None
+        if editors is not None:
+            for editor in editors:
+                editor_name = editor.get('name', 'unknown')
+                models = editor.get('models')
+                if models is None:
+                    continue
+                for model in models:
+                    languages = model.get('languages')
+                    if languages is not None and len(languages):
+                        add_language_records(languages)
+                        add_language_key((date, org, editor_name))
+                        add_language_count(len(languages))
         
         # Extract IDE chat data
-        if 'copilot_ide_chat' in row and row['copilot_ide_chat']:
-            chat = row['copilot_ide_chat']
-            
-            if 'editors' in chat:
-                for editor in chat['editors']:
-                    editor_name = editor.get('name', 'unknown')
-                    
-                    if 'models' in editor:
-                        for model in editor['models']:
-                            chat_data.append({
-                                'date': date,
-                                'organization': org,
-                                'editor': editor_name,
-                                'feature_type': 'ide_chat',
-                                'total_engaged_users': model.get('total_engaged_users', 0),
-                                'total_chats': model.get('total_chats', 0),
-                                'total_chat_copy_events': model.get('total_chat_copy_events', 0),
-                                'total_chat_insertion_events': model.get('total_chat_insertion_events', 0)
-                            })
+        editors = chat.get('editors') if chat else None
+        if editors is not None:
+            for editor in editors:
+                models = editor.get('models')
+                if models is not None and len(models):
+                    add_chat_records(models)
+                    add_chat_key((date, org, editor.get('name', 'unknown')))
+                    add_chat_count(len(models))
         
         # Extract dotcom chat data
-        if 'copilot_dotcom_chat' in row and row['copilot_dotcom_chat']:
-            dotcom_chat = row['copilot_dotcom_chat']
-            
-            total_chats = 0
-            if 'models' in dotcom_chat and dotcom_chat['models'] and len(dotcom_chat['models']) > 0:
-                total_chats = dotcom_chat['models'][0].get('total_chats', 0)
-            
-            chat_data.append({
-                'date': date,
-                'organization': org,
-                'editor': 'github.com',
-                'feature_type': 'dotcom_chat',
-                'total_engaged_users': dotcom_chat.get('total_engaged_users', 0),
-                'total_chats': total_chats,
-                'total_chat_copy_events': 0,
-                'total_chat_insertion_events': 0
-            })
-    
-    return pd.DataFrame(chat_data)
+        if dotcom_chat:
+            models = dotcom_chat.get('models')
+            has_models = models is not None and len(models) > 0
+            total_chats = models[0].get('total_chats', 0) if has_models else 0
+            add_dotcom_chat_row((date, org, dotcom_chat.get('total_engaged_users', 0), total_chats))
+            if has_models:
+                add_dotcom_records(models)
+                add_dotcom_key((date, org))
+                add_dotcom_count(len(models))
+        
+        # Extract dotcom pull request data
+        if isinstance(pull_requests, dict):
+            add_pull_request_row((date, org, pull_requests.get('total_engaged_users', 0)))
+    
+    # Empty key frames come out with object columns; give every piece the source
+    # date type so concatenating one does not turn the date column into object
+    key_types = {'date': df['date'].dtype}
+    
+    # Language metrics
+    lang_df = repeat_keys(language_keys, language_counts).astype(key_types)
+    lang_metrics = records_frame(language_records, LANGUAGE_RECORD)
+    lang_df = lang_df.join(lang_metrics.rename(columns={'name': 'language'}))
+    lang_df = lang_df.fillna({'language': 'unknown', **{c: 0 for c in LANGUAGE_FIELDS[1:]}})
+    lang_df['feature_type'] = 'code_completions'
+    
+    # IDE chat and dotcom chat metrics
+    ide_chat_df = repeat_keys(chat_keys, chat_counts).astype(key_types)
+    ide_chat_df['feature_type'] = 'ide_chat'
+    ide_chat_df = ide_chat_df.join(
+        records_frame(chat_records, CHAT_MODEL_RECORD)
+    )
+    dotcom_chat_df = pd.DataFrame.from_records(
+        dotcom_chat_rows, columns=['date', 'organization', 'total_engaged_users', 'total_chats']
+    ).astype(key_types)
+    dotcom_chat_df = dotcom_chat_df.assign(
+        editor='github.com', feature_type='dotcom_chat',
+        total_chat_copy_events=0, total_chat_insertion_events=0
+    )
+    chat_df = pd.concat([ide_chat_df, dotcom_chat_df[ide_chat_df.columns]], ignore_index=True)
+    chat_df = chat_df.fillna({c: 0 for c in CHAT_MODEL_FIELDS})
+    
+    # GitHub.com usage: one row per web chat model plus one per pull request summary
+    web_chat_df = repeat_keys(dotcom_keys, dotcom_counts, columns=('date', 'organization')).astype(key_types)
+    web_chat_df['feature'] = 'Web Chat'
+    web_chat_df = web_chat_df.join(
+        records_frame(dotcom_records, DOTCOM_MODEL_RECORD).rename(columns={
+            'name': 'model', 'is_custom_model': 'is_custom', 'total_engaged_users': 'engaged_users'
+        })
+    )
+    pull_request_df = pd.DataFrame.from_records(
+        pull_request_rows, columns=['date', 'organization', 'engaged_users']
+    ).astype(key_types)
+    pull_request_df = pull_request_df.assign(
+        feature='Pull Requests', model='default', is_custom=False, total_chats=0
+    )
+    dotcom_df = pd.concat([web_chat_df, pull_request_df[web_chat_df.columns]], ignore_index=True)
+    dotcom_df = dotcom_df.fillna({'model': 'unknown', 'is_custom': False, 'total_chats': 0, 'engaged_users': 0})
+    
+    # Daily per-language/per-editor counts fit comfortably in int32, which halves
+    # the bytes every later groupby moves (pandas still sums into 64-bit)
+    lang_df = lang_df.astype({c: np.int32 for c in LANGUAGE_FIELDS[1:]})
+    chat_df = chat_df.astype({c: np.int32 for c in CHAT_MODEL_FIELDS})
+    dotcom_df = dotcom_df.astype({'is_custom': bool, 'total_chats': np.int32, 'engaged_users': np.int32})
+    
+    # Low-cardinality labels repeat on every record; store them as integer codes
+    lang_df = lang_df.astype({c: 'category' for c in ['organization', 'editor', 'language', 'feature_type']})
+    chat_df = chat_df.astype({c: 'category' for c in ['organization', 'editor', 'feature_type']})
+    dotcom_df = dotcom_df.astype({c: 'category' for c in ['organization', 'feature', 'model']})
+    
+    # Keep every frame in date order (the concats above append per source) so
+    # period filters can slice them with slice_dates()
+    chat_df = chat_df.sort_values('date', kind='stable', ignore_index=True)
+    dotcom_df = dotcom_df.sort_values('date', kind='stable', ignore_index=True)
+    
+    return lang_df, chat_df, dotcom_df
 
 # =====================================================================
 # UTILITY FUNCTIONS
@@ -160,22 +293,120 @@ def calculate_acceptance_rate(lang_df):
     if lang_df.empty:
         return 0
     
-    total_suggestions = lang_df['total_code_suggestions'].sum()
-    total_acceptances = lang_df['total_code_acceptances'].sum()
+    # Reduce both columns in one pass over a contiguous block
+    total_suggestions, total_acceptances = (
+        lang_df[['total_code_suggestions', 'total_code_acceptances']].to_numpy().sum(axis=0)
+    )
     
     return (total_acceptances / total_suggestions * 100) if total_suggestions > 0 else 0
 
+def acceptance_rates(totals):
+    """Calculate code acceptance rate for each row."""
+    # Rows without suggestions get 0, as in calculate_acceptance_rate
+    suggestions = totals['total_code_suggestions']
+    return (totals['total_code_acceptances'] / suggestions.where(suggestions > 0)).fillna(0).mul(100)
+
+def group_sums(frame, key, columns):
+    """Sum columns per key value, one row per key in sorted order."""
+    # Same result as groupby(key, observed=True)[columns].sum() without pandas'
+    # per-column groupby dispatch; rows with a missing key are dropped likewise
+    codes, uniques = pd.factorize(frame[key], sort=True)
+    # factorize codes missing keys as -1, which bincount rejects
+    keep = codes >= 0
+    codes = codes[keep]
+    sums = {
+        c: np.bincount(codes, weights=frame[c].to_numpy()[keep], minlength=len(uniques)).astype(np.int64)
+        for c in columns
+    }
+    return pd.DataFrame({key: uniques, **sums})
+
+def feature_totals(dotcom_df):
+    """Sum chats and engaged users per GitHub.com feature."""
+    # Features without rows are reported as 0
+    totals = dotcom_df.groupby('feature', observed=True)[['total_chats', 'engaged_users']].sum()
+    return totals.reindex(['Web Chat', 'Pull Requests'], fill_value=0)
+
+# Length in days of each "Last N days" period view; "All time" is unbounded
+PERIOD_DAYS = {"Last 7 days": 7, "Last 14 days": 14, "Last 30 days": 30}
+
+def period_bounds(max_date, period_option):
+    """Return the start dates of the selected period and of the previous one."""
+    # The previous period has the same length and ends the day before start_date;
+    # both are None for "All time"
+    days = PERIOD_DAYS.get(period_option)
+    if days is None:
+        return None, None
+    start_date = max_date - pd.Timedelta(days=days-1)
+    return start_date, start_date - pd.Timedelta(days=days)
+
+def slice_dates(frame, start=None, stop=None):
+    """Select rows of a date-sorted frame from start up to (not including) stop."""
+    # Binary search on the sorted dates instead of a boolean mask
+    dates = frame['date']
+    lo = dates.searchsorted(start, side='left') if start is not None else 0
+    hi = dates.searchsorted(stop, side='left') if stop is not None else len(frame)
+    return frame.iloc[lo:hi]
+
+@st.cache_data(show_spinner=False)
+def summarize_languages(lang_df):
+    """Aggregate language metrics per date and language."""
+    # Rows come out in first-seen order; callers only re-group them by language
+    return lang_df.groupby(['date', 'language'], observed=True, sort=False, as_index=False)[
+        ['total_engaged_users', 'total_code_acceptances', 'total_code_suggestions']
+    ].sum()
+
+@st.cache_data(show_spinner=False)
+def summarize_github_dotcom(dotcom_df):
+    """Aggregate GitHub.com engaged users per (date, feature) and per (model, is_custom)."""
+    daily_usage = dotcom_df.groupby(['date', 'feature'], observed=True, as_index=False)['engaged_users'].sum()
+    model_usage = dotcom_df.groupby(['model', 'is_custom'], observed=True, as_index=False)['engaged_users'].sum()
+    return daily_usage, model_usage
+
+@st.cache_data(show_spinner=False)
+def summarize_collection(df):
+    """Summarize data coverage and collection sessions."""
+    # Callers pass only the date, organization and download_timestamp columns
+    # so the cache key hashes three flat columns instead of the nested payloads
+    org_coverage = df.groupby('organization', sort=False)['date'].nunique()
+    
+    download_counts = df.groupby('organization', as_index=False)['download_timestamp'].nunique()
+    download_counts.columns = ['organization', 'download_sessions']
+    
+    timeline = df.groupby('download_timestamp', as_index=False).size()
+    timeline.columns = ['download_timestamp', 'records_collected']
+    return org_coverage, download_counts, timeline
+
 # =====================================================================
 # DASHBOARD FUNCTIONS
 # =====================================================================
 
+def period_widgets(key_prefix, default_index):
+    """Render the period selector and comparison toggle."""
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        period_option = st.selectbox(
+            "Select Period View",
+            [*PERIOD_DAYS, "All time"],
+            index=default_index,
+            key=f"{key_prefix}_period_filter"
+        )
+    
+    with col2:
+        compare_previous = st.checkbox(
+            "Compare with Previous Period",
+            value=False,
+            key=f"{key_prefix}_compare_filter"
+        )
+    
+    return period_option, compare_previous
+
 def render_overview(df):
     """Render the overview section."""
     st.header("📊 Overview")
     
-    # Get latest metrics
-    latest_date = df['date'].max()
-    latest_data = df[df['date'] == latest_date].iloc[0]
+    # Get latest metrics (first row holding the latest date)
+    latest_data = df.iloc[df['date'].argmax()]
+    latest_date = latest_data['date']
     
     # Show data context
     st.info(f"📅 **Latest Data:** {latest_date.strftime('%B %d, %Y')} | **Organization:** {latest_data.get('organization', 'N/A')}")
@@ -208,7 +439,8 @@ def render_overview(df):
     
     with col4:
         data_points = len(df)
-        date_range = (df['date'].max() - df['date'].min()).days + 1 if len(df) > 1 else 1
+        # Rows are in date order, so the span runs from the first row to the last
+        date_range = (df['date'].iat[-1] - df['date'].iat[0]).days + 1 if len(df) > 1 else 1
         st.metric(
             "Data Coverage",
             f"{date_range} days",
@@ -222,7 +454,7 @@ def render_trends(df):
     # Time series chart
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df['date'],
         y=df['total_active_users'],
         mode='lines+markers',
@@ -231,7 +463,7 @@ def render_trends(df):
         marker=dict(size=6)
     ))
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df['date'],
         y=df['total_engaged_users'],
         mode='lines+markers',
@@ -251,6 +483,9 @@ def render_trends(df):
     st.plotly_chart(fig, use_container_width=True, key="trends_users_over_time")
     st.caption("📈 Track user engagement patterns and growth over time across all organizations")
 
+# Panels with their own period widgets run as fragments: changing those widgets
+# reruns only the panel, not the extraction, filters and other sections
+@st.fragment
 def render_language_analysis(lang_df):
     """Render language analysis."""
     st.header("💻 Programming Languages")
@@ -259,82 +494,51 @@ def render_language_analysis(lang_df):
         st.warning("No language data available")
         return
     
-    # Period filter for language analysis
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        period_option = st.selectbox(
-            "Select Period View",
-            ["Last 7 days", "Last 14 days", "Last 30 days", "All time"],
-            index=2,  # Default to Last 30 days for languages
-            key="lang_period_filter"
-        )
-    
-    with col2:
-        compare_previous = st.checkbox(
-            "Compare with Previous Period",
-            value=False,
-            key="lang_compare_filter"
-        )
+    # Period filter for language analysis (defaults to Last 30 days)
+    period_option, compare_previous = period_widgets("lang", 2)
     
     # Filter data based on period selection
-    filtered_lang_df = lang_df.copy()
+    filtered_lang_df = lang_df
     previous_lang_df = pd.DataFrame()
     
-    if period_option != "All time":
-        max_date = lang_df['date'].max()
-        if period_option == "Last 7 days":
-            days = 7
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 14 days":
-            days = 14
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 30 days":
-            days = 30
-            start_date = max_date - pd.Timedelta(days=days-1)
-        
-        filtered_lang_df = lang_df[lang_df['date'] >= start_date]
+    start_date, prev_start = period_bounds(lang_df['date'].max(), period_option)
+    if start_date is not None:
+        filtered_lang_df = slice_dates(lang_df, start_date)
         
         # Calculate previous period if comparison is enabled
         if compare_previous:
-            prev_start = start_date - pd.Timedelta(days=days)
-            prev_end = start_date - pd.Timedelta(days=1)
-            previous_lang_df = lang_df[(lang_df['date'] >= prev_start) & (lang_df['date'] <= prev_end)]
+            previous_lang_df = slice_dates(lang_df, prev_start, start_date)
     
     # Language popularity over time
-    lang_summary = filtered_lang_df.groupby(['date', 'language']).agg({
-        'total_engaged_users': 'sum',
-        'total_code_acceptances': 'sum',
-        'total_code_suggestions': 'sum'
-    }).reset_index()
+    lang_summary = summarize_languages(filtered_lang_df)
+    
+    # Per-language totals feed both the popularity and the acceptance rate charts
+    total_columns = ['total_engaged_users', 'total_code_acceptances', 'total_code_suggestions']
+    lang_totals = lang_summary.groupby('language', observed=True)[total_columns].sum()
     
     # Top languages by engaged users
-    top_languages = lang_summary.groupby('language')['total_engaged_users'].sum().sort_values(ascending=False).head(10)
+    top_languages = lang_totals['total_engaged_users'].nlargest(10)
     
     # Calculate previous period data if comparison is enabled
     prev_lang_summary = pd.DataFrame()
     if compare_previous and not previous_lang_df.empty:
-        prev_lang_summary = previous_lang_df.groupby(['date', 'language']).agg({
-            'total_engaged_users': 'sum',
-            'total_code_acceptances': 'sum',
-            'total_code_suggestions': 'sum'
-        }).reset_index()
+        prev_lang_summary = summarize_languages(previous_lang_df)
+        prev_lang_totals = prev_lang_summary.groupby('language', observed=True)[total_columns].sum()
     
     col1, col2 = st.columns(2)
     
     with col1:
         if compare_previous and not prev_lang_summary.empty:
-            # Compare current vs previous period
-            current_totals = lang_summary.groupby('language')['total_engaged_users'].sum()
-            prev_totals = prev_lang_summary.groupby('language')['total_engaged_users'].sum()
-            
-            # Combine data for comparison
+            # Combine current and previous period totals for comparison
             comparison_data = pd.DataFrame({
-                'Current Period': current_totals,
-                'Previous Period': prev_totals
+                'Current Period': lang_totals['total_engaged_users'],
+                'Previous Period': prev_lang_totals['total_engaged_users']
             }).fillna(0).reset_index()
             
             # Get top languages from current period for consistent ordering
-            top_langs = comparison_data.set_index('language').loc[top_languages.index[:10]].reset_index()
+            top_langs = pd.DataFrame({'language': top_languages.index}).merge(
+                comparison_data, on='language', how='left'
+            )
             
             fig = px.bar(
                 top_langs.melt(id_vars='language', var_name='Period', value_name='Engaged Users'),
@@ -362,17 +566,11 @@ def render_language_analysis(lang_df):
     
     with col2:
         # Acceptance rates by language
-        lang_rates = lang_summary.groupby('language').apply(
-            lambda x: (x['total_code_acceptances'].sum() / x['total_code_suggestions'].sum() * 100) 
-            if x['total_code_suggestions'].sum() > 0 else 0
-        ).sort_values(ascending=False).head(10)
+        lang_rates = acceptance_rates(lang_totals).nlargest(10)
         
         if compare_previous and not prev_lang_summary.empty:
             # Compare acceptance rates
-            prev_rates = prev_lang_summary.groupby('language').apply(
-                lambda x: (x['total_code_acceptances'].sum() / x['total_code_suggestions'].sum() * 100) 
-                if x['total_code_suggestions'].sum() > 0 else 0
-            )
+            prev_rates = acceptance_rates(prev_lang_totals)
             
             # Combine rates for comparison
             rates_comparison = pd.DataFrame({
@@ -381,7 +579,9 @@ def render_language_analysis(lang_df):
             }).fillna(0).reset_index()
             
             # Get top languages from current period for consistent ordering
-            top_rates = rates_comparison.set_index('language').loc[lang_rates.index[:10]].reset_index()
+            top_rates = pd.DataFrame({'language': lang_rates.index}).merge(
+                rates_comparison, on='language', how='left'
+            )
             
             fig = px.bar(
                 top_rates.melt(id_vars='language', var_name='Period', value_name='Acceptance Rate'),
@@ -407,61 +607,40 @@ def render_language_analysis(lang_df):
         st.plotly_chart(fig, use_container_width=True, key="lang_acceptance_rates")
         st.caption("✅ Languages with highest acceptance rates - shows where Copilot suggestions are most helpful")
 
+@st.fragment
 def render_editor_analysis(lang_df, chat_df):
     """Render editor analysis."""
     st.header("🖥️ Editor Usage")
     
-    # Period filter for daily view
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        period_option = st.selectbox(
-            "Select Period View",
-            ["Last 7 days", "Last 14 days", "Last 30 days", "All time"],
-            index=0,
-            key="editor_period_filter"
-        )
+    if lang_df.empty:
+        st.info("No editor data available for analysis")
+        return
     
-    with col2:
-        compare_previous = st.checkbox(
-            "Compare with Previous Period",
-            value=False,
-            key="editor_compare_filter"
-        )
+    # Period filter for daily view
+    period_option, compare_previous = period_widgets("editor", 0)
     
     # Filter data based on period selection
-    filtered_lang_df = lang_df.copy()
-    filtered_chat_df = chat_df.copy()
+    filtered_lang_df = lang_df
+    filtered_chat_df = chat_df
     previous_lang_df = pd.DataFrame()
     
-    if not lang_df.empty and period_option != "All time":
-        max_date = lang_df['date'].max()
-        if period_option == "Last 7 days":
-            days = 7
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 14 days":
-            days = 14
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 30 days":
-            days = 30
-            start_date = max_date - pd.Timedelta(days=days-1)
-        
-        filtered_lang_df = lang_df[lang_df['date'] >= start_date]
+    start_date, prev_start = period_bounds(lang_df['date'].max(), period_option)
+    if start_date is not None:
+        filtered_lang_df = slice_dates(lang_df, start_date)
         if not chat_df.empty:
-            filtered_chat_df = chat_df[chat_df['date'] >= start_date]
+            filtered_chat_df = slice_dates(chat_df, start_date)
         
         # Calculate previous period if comparison is enabled
         if compare_previous:
-            prev_start = start_date - pd.Timedelta(days=days)
-            prev_end = start_date - pd.Timedelta(days=1)
-            previous_lang_df = lang_df[(lang_df['date'] >= prev_start) & (lang_df['date'] <= prev_end)]
+            previous_lang_df = slice_dates(lang_df, prev_start, start_date)
     
     # Daily usage by editor (not accumulated)
     if not filtered_lang_df.empty:
         # Group by date and editor to show daily patterns
-        daily_editor = filtered_lang_df.groupby(['date', 'editor']).agg({
+        daily_editor = filtered_lang_df.groupby(['date', 'editor'], observed=True, as_index=False).agg({
             'total_engaged_users': 'mean',  # Use mean to avoid double counting
             'total_code_acceptances': 'sum'
-        }).reset_index()
+        })
         
         # Create tabs for different views
         tab1, tab2 = st.tabs(["📊 Daily Engaged Users", "📈 Editor Summary"])
@@ -483,30 +662,21 @@ def render_editor_analysis(lang_df, chat_df):
         
         with tab2:
             # Summary view by editor
-            editor_summary = filtered_lang_df.groupby('editor').agg({
+            editor_agg = {
                 'total_engaged_users': 'mean',  # Average daily users
                 'total_code_acceptances': 'sum',
                 'total_code_suggestions': 'sum'
-            }).reset_index()
+            }
+            editor_summary = filtered_lang_df.groupby('editor', observed=True, as_index=False).agg(editor_agg)
             
             # Calculate acceptance rate
-            editor_summary['acceptance_rate'] = (
-                editor_summary['total_code_acceptances'] / 
-                editor_summary['total_code_suggestions'] * 100
-            ).fillna(0)
+            editor_summary['acceptance_rate'] = acceptance_rates(editor_summary)
             
             # Calculate previous period data if comparison is enabled
             prev_editor_summary = pd.DataFrame()
             if compare_previous and not previous_lang_df.empty:
-                prev_editor_summary = previous_lang_df.groupby('editor').agg({
-                    'total_engaged_users': 'mean',
-                    'total_code_acceptances': 'sum',
-                    'total_code_suggestions': 'sum'
-                }).reset_index()
-                prev_editor_summary['acceptance_rate'] = (
-                    prev_editor_summary['total_code_acceptances'] / 
-                    prev_editor_summary['total_code_suggestions'] * 100
-                ).fillna(0)
+                prev_editor_summary = previous_lang_df.groupby('editor', observed=True, as_index=False).agg(editor_agg)
+                prev_editor_summary['acceptance_rate'] = acceptance_rates(prev_editor_summary)
             
             col1, col2 = st.columns(2)
             
@@ -585,93 +755,49 @@ def render_editor_analysis(lang_df, chat_df):
     else:
         st.info("No editor data available for analysis")
 
-def render_chat_interactions(df):
+@st.fragment
+def render_chat_interactions(chat_df):
     """Render chat interaction analysis (copy/paste events)."""
     st.header("💬 Chat Interactions")
     
-    if df.empty:
-        st.warning("No data available")
-        return
+    # IDE chat copy/insertion events, already flattened by extract_all_metrics
+    chat_df = chat_df[chat_df['feature_type'] == 'ide_chat'].rename(columns={
+        'total_chat_copy_events': 'copy_events',
+        'total_chat_insertion_events': 'insertion_events',
+        'total_engaged_users': 'engaged_users'
+    })
     
-    # Extract chat copy/insertion events
-    chat_events = []
-    for _, row in df.iterrows():
-        try:
-            ide_chat = row['copilot_ide_chat']
-            if isinstance(ide_chat, dict) and 'editors' in ide_chat:
-                for editor in ide_chat['editors']:
-                    if 'models' in editor and len(editor['models']) > 0:
-                        for model in editor['models']:
-                            chat_events.append({
-                                'date': row['date'],
-                                'organization': row['organization'],
-                                'editor': editor['name'],
-                                'model': model['name'],
-                                'copy_events': model.get('total_chat_copy_events', 0),
-                                'insertion_events': model.get('total_chat_insertion_events', 0),
-                                'total_chats': model.get('total_chats', 0),
-                                'engaged_users': model.get('total_engaged_users', 0)
-                            })
-        except Exception as e:
-            continue
-    
-    if not chat_events:
+    if chat_df.empty:
         st.info("No chat interaction data available")
         return
     
-    chat_df = pd.DataFrame(chat_events)
-    
-    # Period filter for chat interactions
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        period_option = st.selectbox(
-            "Select Period View",
-            ["Last 7 days", "Last 14 days", "Last 30 days", "All time"],
-            index=1,  # Default to Last 14 days for chat
-            key="chat_period_filter"
-        )
-    
-    with col2:
-        compare_previous = st.checkbox(
-            "Compare with Previous Period",
-            value=False,
-            key="chat_compare_filter"
-        )
+    # Period filter for chat interactions (defaults to Last 14 days)
+    period_option, compare_previous = period_widgets("chat", 1)
     
     # Filter data based on period selection
-    filtered_chat_df = chat_df.copy()
+    filtered_chat_df = chat_df
     previous_chat_df = pd.DataFrame()
     
-    if period_option != "All time":
-        max_date = chat_df['date'].max()
-        if period_option == "Last 7 days":
-            days = 7
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 14 days":
-            days = 14
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 30 days":
-            days = 30
-            start_date = max_date - pd.Timedelta(days=days-1)
-        
-        filtered_chat_df = chat_df[chat_df['date'] >= start_date]
+    start_date, prev_start = period_bounds(chat_df['date'].max(), period_option)
+    if start_date is not None:
+        filtered_chat_df = slice_dates(chat_df, start_date)
         
         # Calculate previous period if comparison is enabled
         if compare_previous:
-            prev_start = start_date - pd.Timedelta(days=days)
-            prev_end = start_date - pd.Timedelta(days=1)
-            previous_chat_df = chat_df[(chat_df['date'] >= prev_start) & (chat_df['date'] <= prev_end)]
+            previous_chat_df = slice_dates(chat_df, prev_start, start_date)
     
     # Metrics overview
     col1, col2, col3, col4 = st.columns(4)
     
     # Calculate previous period metrics for comparison
-    prev_total_copy = previous_chat_df['copy_events'].sum() if compare_previous and not previous_chat_df.empty else 0
-    prev_total_insertion = previous_chat_df['insertion_events'].sum() if compare_previous and not previous_chat_df.empty else 0
-    prev_total_chats = previous_chat_df['total_chats'].sum() if compare_previous and not previous_chat_df.empty else 0
+    event_columns = ['copy_events', 'insertion_events', 'total_chats']
+    total_copy, total_insertion, total_chats = filtered_chat_df[event_columns].to_numpy().sum(axis=0)
+    prev_total_copy, prev_total_insertion, prev_total_chats = (
+        previous_chat_df[event_columns].to_numpy().sum(axis=0)
+        if compare_previous and not previous_chat_df.empty else (0, 0, 0)
+    )
     
     with col1:
-        total_copy = filtered_chat_df['copy_events'].sum()
         delta_copy = total_copy - prev_total_copy if compare_previous else None
         st.metric(
             "Total Copy Events", 
@@ -681,7 +807,6 @@ def render_chat_interactions(df):
         )
     
     with col2:
-        total_insertion = filtered_chat_df['insertion_events'].sum()
         delta_insertion = total_insertion - prev_total_insertion if compare_previous else None
         st.metric(
             "Total Insertion Events", 
@@ -691,7 +816,6 @@ def render_chat_interactions(df):
         )
     
     with col3:
-        total_chats = filtered_chat_df['total_chats'].sum()
         delta_chats = total_chats - prev_total_chats if compare_previous else None
         st.metric(
             "Total IDE Chats", 
@@ -711,145 +835,84 @@ def render_chat_interactions(df):
             help="Percentage of chat interactions that resulted in code being copied. Higher rates indicate users find chat suggestions valuable"
         )
     
-    # Charts
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Daily chat interactions
-        daily_events = filtered_chat_df.groupby('date').agg({
-            'copy_events': 'sum',
-            'insertion_events': 'sum',
-            'total_chats': 'sum'
-        }).reset_index()
-        
-        fig = px.line(
-            daily_events,
-            x='date',
-            y=['copy_events', 'insertion_events'],
-            title=f"Daily Chat Copy/Insertion Events ({period_option})",
-            labels={'value': 'Events', 'date': 'Date'}
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True, key="chat_daily_events")
-        st.caption("📈 Track daily chat interactions to identify usage patterns and peaks")
-    
-    with col2:
-        # Events by editor
-        editor_events = filtered_chat_df.groupby('editor').agg({
-            'copy_events': 'sum',
-            'insertion_events': 'sum'
-        }).reset_index()
-        
-        fig = px.bar(
-            editor_events,
-            x='editor',
-            y=['copy_events', 'insertion_events'],
-            title=f"Chat Events by Editor ({period_option})",
-            labels={'value': 'Events', 'editor': 'Editor'},
-            barmode='group'
+    # Charts: daily events and events by editor plot the same two series, so they
+    # share one figure (and one legend) side by side
+    event_series = [('copy_events', 'Copy Events', '#636efa'), ('insertion_events', 'Insertion Events', '#ef553b')]
+    daily_events = group_sums(filtered_chat_df, 'date', ['copy_events', 'insertion_events'])
+    editor_events = group_sums(filtered_chat_df, 'editor', ['copy_events', 'insertion_events'])
+    
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=(
+            f"Daily Chat Copy/Insertion Events ({period_option})",
+            f"Chat Events by Editor ({period_option})"
         )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True, key="chat_events_by_editor")
-        st.caption("🔧 Compare how different editors facilitate chat-to-code workflows")
+    )
+    for column, name, color in event_series:
+        fig.add_trace(go.Scattergl(
+            x=daily_events['date'],
+            y=daily_events[column],
+            mode='lines',
+            name=name,
+            legendgroup=column,
+            line=dict(color=color)
+        ), row=1, col=1)
+        fig.add_trace(go.Bar(
+            x=editor_events['editor'],
+            y=editor_events[column],
+            name=name,
+            legendgroup=column,
+            showlegend=False,
+            marker_color=color
+        ), row=1, col=2)
+    
+    fig.update_layout(height=400, barmode='group')
+    fig.update_xaxes(title_text="Date", row=1, col=1)
+    fig.update_xaxes(title_text="Editor", row=1, col=2)
+    fig.update_yaxes(title_text="Events")
+    st.plotly_chart(fig, use_container_width=True, key="chat_events")
+    st.caption("📈 Track daily chat interactions to identify usage patterns and peaks, and 🔧 compare how different editors facilitate chat-to-code workflows")
 
-def render_github_dotcom_usage(df):
+@st.fragment
+def render_github_dotcom_usage(dotcom_df):
     """Render GitHub.com (web) usage analysis."""
     st.header("🌐 GitHub.com Usage")
     
-    if df.empty:
-        st.warning("No data available")
-        return
-    
-    # Extract GitHub.com data
-    dotcom_data = []
-    for _, row in df.iterrows():
-        try:
-            # Dotcom Chat
-            dotcom_chat = row['copilot_dotcom_chat']
-            if isinstance(dotcom_chat, dict) and 'models' in dotcom_chat:
-                for model in dotcom_chat['models']:
-                    dotcom_data.append({
-                        'date': row['date'],
-                        'organization': row['organization'],
-                        'feature': 'Web Chat',
-                        'model': model['name'],
-                        'is_custom': model.get('is_custom_model', False),
-                        'total_chats': model.get('total_chats', 0),
-                        'engaged_users': model.get('total_engaged_users', 0)
-                    })
-            
-            # Dotcom Pull Requests
-            dotcom_pr = row['copilot_dotcom_pull_requests']
-            if isinstance(dotcom_pr, dict):
-                dotcom_data.append({
-                    'date': row['date'],
-                    'organization': row['organization'],
-                    'feature': 'Pull Requests',
-                    'model': 'default',
-                    'is_custom': False,
-                    'total_chats': 0,  # Not applicable
-                    'engaged_users': dotcom_pr.get('total_engaged_users', 0)
-                })
-        except Exception as e:
-            continue
-    
-    if not dotcom_data:
+    # Web chat models and pull request usage, already flattened by extract_all_metrics
+    if dotcom_df.empty:
         st.info("No GitHub.com usage data available")
         return
     
-    dotcom_df = pd.DataFrame(dotcom_data)
-    
-    # Period filter for GitHub.com usage
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        period_option = st.selectbox(
-            "Select Period View",
-            ["Last 7 days", "Last 14 days", "Last 30 days", "All time"],
-            index=1,  # Default to Last 14 days for dotcom
-            key="dotcom_period_filter"
-        )
-    
-    with col2:
-        compare_previous = st.checkbox(
-            "Compare with Previous Period",
-            value=False,
-            key="dotcom_compare_filter"
-        )
+    # Period filter for GitHub.com usage (defaults to Last 14 days)
+    period_option, compare_previous = period_widgets("dotcom", 1)
     
     # Filter data based on period selection
-    filtered_dotcom_df = dotcom_df.copy()
+    filtered_dotcom_df = dotcom_df
     previous_dotcom_df = pd.DataFrame()
     
-    if period_option != "All time":
-        max_date = dotcom_df['date'].max()
-        if period_option == "Last 7 days":
-            days = 7
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 14 days":
-            days = 14
-            start_date = max_date - pd.Timedelta(days=days-1)
-        elif period_option == "Last 30 days":
-            days = 30
-            start_date = max_date - pd.Timedelta(days=days-1)
-        
-        filtered_dotcom_df = dotcom_df[dotcom_df['date'] >= start_date]
+    start_date, prev_start = period_bounds(dotcom_df['date'].max(), period_option)
+    if start_date is not None:
+        filtered_dotcom_df = slice_dates(dotcom_df, start_date)
         
         # Calculate previous period if comparison is enabled
         if compare_previous:
-            prev_start = start_date - pd.Timedelta(days=days)
-            prev_end = start_date - pd.Timedelta(days=1)
-            previous_dotcom_df = dotcom_df[(dotcom_df['date'] >= prev_start) & (dotcom_df['date'] <= prev_end)]
+            previous_dotcom_df = slice_dates(dotcom_df, prev_start, start_date)
     
     # Metrics overview
     col1, col2, col3 = st.columns(3)
     
     # Calculate previous period metrics for comparison
-    prev_web_chats = previous_dotcom_df[previous_dotcom_df['feature'] == 'Web Chat']['total_chats'].sum() if compare_previous and not previous_dotcom_df.empty else 0
-    prev_web_users = previous_dotcom_df[previous_dotcom_df['feature'] == 'Web Chat']['engaged_users'].sum() if compare_previous and not previous_dotcom_df.empty else 0
-    prev_pr_users = previous_dotcom_df[previous_dotcom_df['feature'] == 'Pull Requests']['engaged_users'].sum() if compare_previous and not previous_dotcom_df.empty else 0
+    totals = feature_totals(filtered_dotcom_df)
+    prev_totals = (
+        feature_totals(previous_dotcom_df)
+        if compare_previous and not previous_dotcom_df.empty else totals * 0
+    )
+    prev_web_chats = prev_totals.at['Web Chat', 'total_chats']
+    prev_web_users = prev_totals.at['Web Chat', 'engaged_users']
+    prev_pr_users = prev_totals.at['Pull Requests', 'engaged_users']
     
     with col1:
-        web_chats = filtered_dotcom_df[filtered_dotcom_df['feature'] == 'Web Chat']['total_chats'].sum()
+        web_chats = totals.at['Web Chat', 'total_chats']
         delta_chats = web_chats - prev_web_chats if compare_previous else None
         st.metric(
             "Total Web Chats", 
@@ -859,7 +922,7 @@ def render_github_dotcom_usage(df):
         )
     
     with col2:
-        web_users = filtered_dotcom_df[filtered_dotcom_df['feature'] == 'Web Chat']['engaged_users'].sum()
+        web_users = totals.at['Web Chat', 'engaged_users']
         delta_web_users = web_users - prev_web_users if compare_previous else None
         st.metric(
             "Web Chat Users", 
@@ -869,7 +932,7 @@ def render_github_dotcom_usage(df):
         )
     
     with col3:
-        pr_users = filtered_dotcom_df[filtered_dotcom_df['feature'] == 'Pull Requests']['engaged_users'].sum()
+        pr_users = totals.at['Pull Requests', 'engaged_users']
         delta_pr_users = pr_users - prev_pr_users if compare_previous else None
         st.metric(
             "PR Feature Users", 
@@ -879,42 +942,48 @@ def render_github_dotcom_usage(df):
         )
     
     # Charts
+    daily_usage, model_usage = summarize_github_dotcom(filtered_dotcom_df)
     col1, col2 = st.columns(2)
     
     with col1:
-        # Daily usage trends
-        daily_usage = filtered_dotcom_df.groupby(['date', 'feature']).agg({
-            'engaged_users': 'sum'
-        }).reset_index()
-        
-        fig = px.line(
-            daily_usage,
-            x='date',
-            y='engaged_users',
-            color='feature',
+        # Daily usage trends, one line per feature (built directly; the frame is
+        # already aggregated, so Plotly Express has nothing left to reshape)
+        fig = go.Figure()
+        for feature, usage in daily_usage.groupby('feature', observed=True, sort=False):
+            fig.add_trace(go.Scattergl(
+                x=usage['date'],
+                y=usage['engaged_users'],
+                mode='lines',
+                name=feature
+            ))
+        fig.update_layout(
             title=f"Daily GitHub.com Feature Usage ({period_option})",
-            labels={'engaged_users': 'Engaged Users', 'date': 'Date'}
+            xaxis_title="Date",
+            yaxis_title="Engaged Users",
+            legend_title_text="feature",
+            height=400
         )
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True, key="dotcom_daily_usage")
         st.caption("🌐 Monitor web-based Copilot feature adoption across GitHub.com")
     
     with col2:
         # Model usage (custom vs default)
         if 'model' in filtered_dotcom_df.columns:
-            model_usage = filtered_dotcom_df.groupby(['model', 'is_custom']).agg({
-                'engaged_users': 'sum'
-            }).reset_index()
-            
-            fig = px.bar(
-                model_usage,
-                x='model',
-                y='engaged_users',
-                color='is_custom',
+            fig = go.Figure()
+            for is_custom, usage in model_usage.groupby('is_custom', sort=False):
+                fig.add_trace(go.Bar(
+                    x=usage['model'],
+                    y=usage['engaged_users'],
+                    name=str(is_custom)
+                ))
+            fig.update_layout(
                 title=f"Model Usage ({period_option})",
-                labels={'engaged_users': 'Engaged Users', 'model': 'Model'}
+                xaxis_title="Model",
+                yaxis_title="Engaged Users",
+                legend_title_text="is_custom",
+                barmode='relative',
+                height=400
             )
-            fig.update_layout(height=400)
             st.plotly_chart(fig, use_container_width=True, key="dotcom_model_usage")
             st.caption("🤖 Compare usage between custom and default models on GitHub.com")
 
@@ -926,11 +995,17 @@ def render_data_insights(df):
         st.warning("No data available")
         return
     
+    org_coverage, download_counts, timeline = summarize_collection(
+        df[['date', 'organization', 'download_timestamp']]
+    )
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         # Data freshness
-        latest_download = df['download_timestamp'].max()
+        # The cached collection timeline is sorted by download time, so its last
+        # entry is the latest download; no scan of the column per rerun
+        latest_download = timeline['download_timestamp'].iat[-1] if len(timeline) else pd.NaT
         hours_ago = (pd.Timestamp.now(tz=latest_download.tz) - latest_download).total_seconds() / 3600
         st.metric(
             "Data Freshness", 
@@ -949,7 +1024,6 @@ def render_data_insights(df):
     
     with col3:
         # Collection consistency
-        org_coverage = df.groupby('organization')['date'].nunique()
         if len(org_coverage) > 1 and org_coverage.mean() > 0:
             consistency_variance = (org_coverage.std() / org_coverage.mean() * 100)
             if pd.isna(consistency_variance):
@@ -970,9 +1044,6 @@ def render_data_insights(df):
     
     with col1:
         # Downloads by organization
-        download_counts = df.groupby('organization')['download_timestamp'].nunique().reset_index()
-        download_counts.columns = ['organization', 'download_sessions']
-        
         fig = px.bar(
             download_counts,
             x='organization',
@@ -986,15 +1057,13 @@ def render_data_insights(df):
     
     with col2:
         # Data collection timeline
-        timeline = df.groupby('download_timestamp').size().reset_index()
-        timeline.columns = ['download_timestamp', 'records_collected']
-        
         fig = px.line(
             timeline,
             x='download_timestamp',
             y='records_collected',
             title="Data Collection Timeline",
-            labels={'records_collected': 'Records Collected', 'download_timestamp': 'Download Time'}
+            labels={'records_collected': 'Records Collected', 'download_timestamp': 'Download Time'},
+            render_mode='webgl'
         )
         fig.update_layout(height=300)
         st.plotly_chart(fig, use_container_width=True, key="data_collection_timeline")
@@ -1018,10 +1087,13 @@ def main():
     )
     
     df = None
+    source_key = None
     
     if uploaded_file is not None:
         with st.spinner("Loading uploaded data..."):
             df = load_data_from_file(uploaded_file)
+            # Key on content so re-uploading the same file reuses the extracted metrics
+            source_key = f"upload:{hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()}"
             if df is not None:
                 st.sidebar.success(f"✅ Loaded: {uploaded_file.name}")
                 st.sidebar.info(f"📊 {len(df)} records loaded")
@@ -1030,6 +1102,7 @@ def main():
         local_df = load_data_local()
         if local_df is not None:
             df = local_df
+            source_key = f"local:{LOCAL_DATA_FILE.stat().st_mtime_ns}"
             st.sidebar.info("🔧 Using local development data")
         else:
             # Welcome screen for new users
@@ -1110,8 +1183,7 @@ def main():
         st.stop()
     
     # Process data
-    lang_df = extract_language_metrics(df)
-    chat_df = extract_chat_metrics(df)
+    lang_df, chat_df, dotcom_df = extract_all_metrics(df, source_key)
     
     # Sidebar filters
     st.sidebar.header("📋 Filters")
@@ -1130,9 +1202,12 @@ def main():
         
         if len(date_range) == 2:
             start_date, end_date = date_range
-            df = df[(df['date'].dt.date >= start_date) & (df['date'].dt.date <= end_date)]
-            lang_df = lang_df[(lang_df['date'].dt.date >= start_date) & (lang_df['date'].dt.date <= end_date)]
-            chat_df = chat_df[(chat_df['date'].dt.date >= start_date) & (chat_df['date'].dt.date <= end_date)]
+            start = pd.Timestamp(start_date)
+            stop = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+            df = slice_dates(df, start, stop)
+            lang_df = slice_dates(lang_df, start, stop)
+            chat_df = slice_dates(chat_df, start, stop)
+            dotcom_df = slice_dates(dotcom_df, start, stop)
     
     # Organization filter
     if 'organization' in df.columns:
@@ -1142,6 +1217,7 @@ def main():
             df = df[df['organization'] == selected_org]
             lang_df = lang_df[lang_df['organization'] == selected_org]
             chat_df = chat_df[chat_df['organization'] == selected_org]
+            dotcom_df = dotcom_df[dotcom_df['organization'] == selected_org]
     
     # Render dashboard sections
     if not df.empty:
@@ -1153,9 +1229,9 @@ def main():
         st.divider()
         render_editor_analysis(lang_df, chat_df)
         st.divider()
-        render_chat_interactions(df)
+        render_chat_interactions(chat_df)
         st.divider()
-        render_github_dotcom_usage(df)
+        render_github_dotcom_usage(dotcom_df)
         st.divider()
         render_data_insights(df)
     else:
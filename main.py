@@ -9,49 +9,80 @@ Author: Enderson Menezes
 Created: 2025-06-24
 """
 
-import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 
 
+# Each data file holds one pretty-printed JSON object spanning many lines. Dates
+# stay strings so process_data() parses them (keeping the timestamp's UTC offset)
+JSON_PARSE_OPTIONS = pa_json.ParseOptions(
+    explicit_schema=pa.schema([('date', pa.string()), ('download_timestamp', pa.string())]),
+    unexpected_field_behavior='infer',
+    newlines_in_values=True
+)
+
+
 def load_json_files(data_dir="./data"):
     """Load all JSON files from the data directory structure."""
     data_path = Path(data_dir)
-    all_data = []
+    loaded_files = []
+    tables = []
     
     if not data_path.exists():
         print(f"Data directory {data_dir} does not exist")
         return pd.DataFrame()
     
     # Walk through year=YYYY/month=MM/ structure
-    for year_dir in data_path.glob("year=*"):
-        for month_dir in year_dir.glob("month=*"):
-            for json_file in month_dir.glob("*.json"):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                        # Extract organization from filename if not in data
-                        if 'organization' not in data:
-                            # Extract from filename: DD-<org>.json
-                            filename = json_file.stem  # filename without extension
-                            if '-' in filename:
-                                org_from_filename = filename.split('-', 1)[1]  # Get everything after first dash
-                                data['organization'] = org_from_filename
-                        
-                        all_data.append(data)
-                        print(f"📄 Loaded {json_file}")
-                except Exception as e:
-                    print(f"❌ Error loading {json_file}: {e}")
-    
-    if not all_data:
+    json_files = list(data_path.glob("year=*/month=*/*.json"))
+    
+    # Arrow parses without holding the GIL, so files are read in parallel;
+    # results are still reported in file order. A pretty-printed object may not
+    # straddle two blocks, so each file is read as a single block
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(
+                pa_json.read_json, json_file,
+                read_options=pa_json.ReadOptions(block_size=max(json_file.stat().st_size + 1, 1 << 20)),
+                parse_options=JSON_PARSE_OPTIONS
+            )
+            for json_file in json_files
+        ]
+        for json_file, future in zip(json_files, futures):
+            try:
+                tables.append(future.result())
+                loaded_files.append(json_file)
+                print(f"📄 Loaded {json_file}")
+            except Exception as e:
+                print(f"❌ Error loading {json_file}: {e}")
+    
+    if not tables:
         print("No data files found")
         return pd.DataFrame()
     
-    print(f"✅ Loaded {len(all_data)} data files")
-    return pd.DataFrame(all_data)
+    print(f"✅ Loaded {len(tables)} data files")
+    # Files may disagree on inferred types or carry extra fields; unify them once
+    table = pa.concat_tables(tables, promote_options="permissive")
+    
+    # Extract organization from filenames (DD-<org>.json) for rows that lack one,
+    # splitting all filenames at once and repeating each name per row of its file
+    filename_orgs = pd.Series([f.stem for f in loaded_files]).str.split('-', n=1).str[1]
+    filename_orgs = pa.array(
+        filename_orgs.repeat([t.num_rows for t in tables]), type=pa.string(), from_pandas=True
+    )
+    if 'organization' in table.column_names:
+        index = table.column_names.index('organization')
+        organizations = pc.coalesce(table['organization'], filename_orgs.cast(table.field(index).type))
+        table = table.set_column(index, 'organization', organizations)
+    elif filename_orgs.null_count < len(filename_orgs):
+        table = table.append_column('organization', filename_orgs)
+    
+    return table.to_pandas(split_blocks=True, self_destruct=True)
 
 
 def process_data(df):
@@ -67,9 +98,16 @@ def process_data(df):
     if 'download_timestamp' in df.columns:
         df['download_timestamp'] = pd.to_datetime(df['download_timestamp'])
     
-    # Sort by date
-    if 'date' in df.columns:
-        df = df.sort_values('date')
+    # Store user counts as int32, the type the dashboard works with, so the
+    # Parquet schema does not depend on the values collected
+    for column in ['total_active_users', 'total_engaged_users']:
+        if column in df.columns and pd.api.types.is_integer_dtype(df[column]):
+            df[column] = df[column].astype('int32')
+    
+    # Sort by date; files are mostly read in date order, so skip the sort when
+    # they already are and otherwise use a stable sort that is fast on runs
+    if 'date' in df.columns and not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable', ignore_index=True)
     
     print(f"📊 Processed {len(df)} records")
     return df
@@ -84,18 +122,28 @@ def save_reports(df, output_dir="."):
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Save as single consolidated Parquet file
+    # Save as single consolidated Parquet file. Repeated strings such as the
+    # organization are dictionary-encoded (pyarrow's default) and ZSTD keeps the
+    # nested payload columns small without slowing the dashboard's reads
     parquet_file = output_path / "data.parquet"
-    df.to_parquet(parquet_file, index=False)
+    df.to_parquet(
+        parquet_file,
+        index=False,
+        engine='pyarrow',
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=True,
+        row_group_size=128 * 1024
+    )
     print(f"💾 Saved consolidated Parquet file: {parquet_file}")
     
     # Show organizations included
     if 'organization' in df.columns:
         organizations = df['organization'].unique()
         print(f"� Organizations included: {', '.join(organizations)}")
+        org_counts = df['organization'].value_counts(sort=False)
         for org in organizations:
-            org_count = len(df[df['organization'] == org])
-            print(f"   - {org}: {org_count} records")
+            print(f"   - {org}: {org_counts[org]} records")
 
 
 def print_summary(df):
@@ -114,19 +162,20 @@ def print_summary(df):
         orgs = df['organization'].unique()
         print(f"Organizations ({len(orgs)}): {', '.join(orgs)}")
         
-        # Show summary per organization
+        # Show summary per organization; one grouping pass gives each
+        # organization's record count and its latest row
+        groups = df.groupby('organization', sort=False)
+        record_counts = groups.size()
+        latest_rows = groups.tail(1).set_index('organization')
         for org in orgs:
-            org_df = df[df['organization'] == org]
             print(f"\n  📊 {org}:")
-            print(f"    Records: {len(org_df)}")
+            print(f"    Records: {record_counts[org]}")
             
-            if 'total_active_users' in org_df.columns:
-                latest_active = org_df['total_active_users'].iloc[-1] if len(org_df) > 0 else 'N/A'
-                print(f"    Latest active users: {latest_active}")
+            if 'total_active_users' in df.columns:
+                print(f"    Latest active users: {latest_rows.at[org, 'total_active_users']}")
             
-            if 'total_engaged_users' in org_df.columns:
-                latest_engaged = org_df['total_engaged_users'].iloc[-1] if len(org_df) > 0 else 'N/A'
-                print(f"    Latest engaged users: {latest_engaged}")
+            if 'total_engaged_users' in df.columns:
+                print(f"    Latest engaged users: {latest_rows.at[org, 'total_engaged_users']}")
     else:
         if 'total_active_users' in df.columns:
             print(f"Total active users (latest): {df['total_active_users'].iloc[-1] if len(df) > 0 else 'N/A'}")